@@ -1,14 +1,20 @@
 from __future__ import annotations
 
 import logging
+from decimal import Decimal
 from typing import Any, Optional, Type
 
-from flask import Flask
+from flask import Flask, current_app, has_app_context
 from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import raiseload
 from werkzeug.middleware.proxy_fix import ProxyFix
 
 from .config import DefaultConfig
+from .utils.serialization import ORJSONProvider, dumps
 
 # Global extension instances shared between services
 db = SQLAlchemy()
@@ -20,15 +26,39 @@ def create_app(config_object: Optional[Type[Any]] = None) -> Flask:
     Application factory so both the API service and worker can share configuration.
     """
     app = Flask(__name__, template_folder="templates", static_folder="static")
+    app.json = ORJSONProvider(app)
 
     app.config.from_object(DefaultConfig())
     if config_object:
         app.config.from_object(config_object())
 
+    # Parsed once here so request handlers don't rebuild the Decimal per call.
+    unit_value = Decimal(str(app.config.get("UNIT_VALUE", 1)))
+    app.config["_UNIT_VALUE_DECIMAL"] = unit_value
+    app.config["_UNIT_VALUE_FLOAT"] = float(unit_value)
+
     configure_logging(app)
 
+    # The heartbeat body never changes for the life of the process.
+    app.config["_HEARTBEAT_BODY"] = dumps(
+        {"service": "coachv2", "status": "ok", "log_level": app.config.get("LOG_LEVEL")}
+    )
+
+    configure_engine_options(app)
     db.init_app(app)
     migrate.init_app(app, db)
+    configure_strict_loading(app)
+
+    from .services.cache import build_response_cache
+    from .worker.background import IngestQueue
+
+    app.extensions["recommendations_cache"] = build_response_cache(
+        app.config.get("REDIS_URL", ""),
+        socket_timeout=app.config.get("REDIS_SOCKET_TIMEOUT", 0.5),
+    )
+    app.extensions["ingest_queue"] = IngestQueue()
+    # Sportsbook ids by configured bookmaker keys; filled by the ingest worker.
+    app.extensions["sportsbook_ids"] = {}
 
     # Register HTTP routes via blueprints
     from .api.routes import api_bp
@@ -63,6 +93,42 @@ def configure_logging(app: Flask) -> None:
     app.logger.addHandler(handler)
 
 
+def configure_engine_options(app: Flask) -> None:
+    """
+    Pool sizing only applies to server databases; SQLite (in-memory in particular gets a
+    StaticPool) rejects pool_size/max_overflow.
+    """
+    options = dict(app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {}))
+    if make_url(app.config["SQLALCHEMY_DATABASE_URI"]).get_backend_name() == "sqlite":
+        options.pop("pool_size", None)
+        options.pop("max_overflow", None)
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = options
+
+
+def configure_strict_loading(app: Flask) -> None:
+    """
+    In debug or with STRICT_LOADING enabled, make every lazy relationship load raise
+    so N+1 regressions surface immediately instead of as extra queries. The listener
+    lives on the shared Session class, so it is only attached once some app enables
+    strict loading and then checks the flag resolved here for the current app.
+    """
+    strict = bool(app.config.get("STRICT_LOADING") or app.debug)
+    app.extensions["strict_loading"] = strict
+    if strict and not event.contains(Session, "do_orm_execute", _raise_on_lazy_load):
+        event.listen(Session, "do_orm_execute", _raise_on_lazy_load)
+
+
+def _raise_on_lazy_load(orm_execute_state) -> None:
+    if not has_app_context() or not current_app.extensions.get("strict_loading"):
+        return
+    if (
+        orm_execute_state.is_select
+        and not orm_execute_state.is_column_load
+        and not orm_execute_state.is_relationship_load
+    ):
+        orm_execute_state.statement = orm_execute_state.statement.options(raiseload("*"))
+
+
 def register_cli_commands(app: Flask) -> None:
     """
     Attach CLI helpers for ad-hoc tasks (e.g., manual ingestion runs).
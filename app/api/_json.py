@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+from flask import Response, current_app, request
+
+from app.utils.serialization import dumps
+
+
+def json_bytes_response(body: bytes, status: int = 200) -> Response:
+    """Wrap an already-serialized JSON body in a response."""
+
+    return current_app.response_class(body, status=status, mimetype="application/json")
+
+
+def orjson_response(obj: Any, status: int = 200) -> Response:
+    """Serialize ``obj`` with orjson and wrap it in an ``application/json`` response."""
+
+    return json_bytes_response(dumps(obj), status=status)
+
+
+def parse_json_body() -> Any:
+    """
+    Decode the request body with orjson. Like ``get_json(silent=True)`` it ignores
+    the Content-Type header; malformed bodies raise ``orjson.JSONDecodeError``.
+    """
+    raw = request.get_data(cache=False)
+    return orjson.loads(raw) if raw else None
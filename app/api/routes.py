@@ -1,15 +1,74 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-
 from decimal import Decimal
-from flask import current_app, jsonify, request
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import orjson
+import sqlalchemy as sa
+from flask import abort, current_app, request, url_for
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import raiseload
 
 from app import db
-from app.models import Bet, BetResult, Event, Recommendation
-from app.worker.tasks import run_ingest_cycle
+from app.models import Bet, BetResult, Event, Recommendation, Sportsbook
+from app.services.cache import CachedBody, ResponseCache
+from app.utils.serialization import dumps
 
 from . import api_bp
+from ._json import json_bytes_response, orjson_response, parse_json_body
+
+# Lists at least this long are streamed row by row instead of sent as one body.
+STREAM_MIN_LIMIT = 100
+
+# Statements are built once at import and only re-bound per request. Only the
+# columns the payload needs are projected so no ORM instances are hydrated.
+_LIVE_RECOMMENDATIONS = (
+    sa.select(
+        Recommendation.id,
+        Recommendation.triggered_at,
+        Recommendation.bet_side,
+        Recommendation.direction,
+        Recommendation.confidence,
+        Recommendation.status,
+        Recommendation.details,
+        Event.id.label("event_id"),
+        Event.sport_key,
+        Event.commence_time,
+        Event.home_team,
+        Event.away_team,
+        Event.league,
+        Sportsbook.key.label("sportsbook_key"),
+        Sportsbook.name.label("sportsbook_name"),
+    )
+    .join(Event, Recommendation.event_id == Event.id)
+    .join(Sportsbook, Recommendation.sportsbook_id == Sportsbook.id)
+    .where(
+        sa.or_(Event.commence_time.is_(None), Event.commence_time >= sa.bindparam("now"))
+    )
+    .order_by(Recommendation.triggered_at.desc())
+    .limit(sa.bindparam("limit"))
+)
+
+_BETS_FOR_RECOMMENDATIONS = (
+    sa.select(
+        Bet.recommendation_id,
+        Bet.id,
+        # Cast in SQL so the driver hands back floats instead of Decimals.
+        sa.cast(Bet.stake, sa.Float).label("stake"),
+        Bet.price,
+        Bet.result,
+        Bet.placed_at,
+        Bet.notes,
+    )
+    .where(Bet.recommendation_id.in_(sa.bindparam("rec_ids", expanding=True)))
+    .order_by(Bet.id)
+)
+
+
+@api_bp.errorhandler(orjson.JSONDecodeError)
+def invalid_json(exc: orjson.JSONDecodeError):
+    return orjson_response({"error": f"Invalid JSON body: {exc}"}, status=400)
 
 
 @api_bp.get("/")
@@ -17,129 +76,206 @@ def index():
     """
     Simple heartbeat endpoint. Will expand into dashboard view via templates later.
     """
-    return jsonify(
-        {
-            "service": "coachv2",
-            "status": "ok",
-            "log_level": current_app.config.get("LOG_LEVEL"),
-        }
-    )
+    return json_bytes_response(current_app.config["_HEARTBEAT_BODY"])
 
 
 @api_bp.get("/recommendations")
 def recommendations_index():
     """Return the most recent reverse line movement recommendations."""
 
-    try:
-        limit = int(request.args.get("limit", 50))
-    except (TypeError, ValueError):
-        limit = 50
-    limit = max(1, min(limit, 200))
+    limit = max(1, min(request.args.get("limit", default=50, type=int), 200))
 
-    now = datetime.now(timezone.utc)
+    cache = current_app.extensions["recommendations_cache"]
+    ttl = current_app.config.get("RECOMMENDATIONS_CACHE_TTL", 0)
+    cache_key = f"recommendations:{limit}"
+    if ttl > 0:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return _cached_json_response(cached)
 
-    recommendations = (
-        Recommendation.query.join(Event)
-        .filter(
-            (Event.commence_time.is_(None)) | (Event.commence_time >= now)
+    # Read before querying so a body built from rows that an invalidation has since
+    # made outdated is never cached under the new generation.
+    generation = cache.generation() if ttl > 0 else None
+    unit_value_float = current_app.config["_UNIT_VALUE_FLOAT"]
+    try:
+        rows, bets_by_rec = _recommendation_rows(limit, unit_value_float)
+    except SQLAlchemyError:
+        stale = cache.get(cache_key, allow_stale=True)
+        if stale is None:
+            raise
+        db.session.rollback()
+        current_app.logger.exception("Recommendations query failed; serving stale cache")
+        return _cached_json_response(stale)
+
+    chunks = _encode_recommendations(rows, bets_by_rec, unit_value_float=unit_value_float)
+    stale_ttl = current_app.config.get("RECOMMENDATIONS_CACHE_STALE_TTL", 0)
+
+    if limit < STREAM_MIN_LIMIT:
+        # Small bodies gain nothing from chunked transfer; send them whole with an ETag.
+        body = b"".join(chunks)
+        if ttl <= 0:
+            return json_bytes_response(body)
+        return _cached_json_response(
+            cache.set(cache_key, body, ttl=ttl, stale_ttl=stale_ttl, generation=generation)
         )
-        .order_by(Recommendation.triggered_at.desc())
-        .limit(limit)
-        .all()
-    )
 
-    payload = []
-    unit_value = Decimal(str(current_app.config.get("UNIT_VALUE", 1)))
-    unit_value_float = float(unit_value)
-
-    for rec in recommendations:
-        event = rec.event
-        sportsbook = rec.sportsbook
-        team = None
-        if event:
-            if rec.bet_side == "home":
-                team = event.home_team
-            elif rec.bet_side == "away":
-                team = event.away_team
-
-        bets_payload = [
-            {
-                "id": bet.id,
-                "stake_units": float(bet.stake) if bet.stake is not None else None,
-                "stake_amount": float(bet.stake * unit_value) if bet.stake is not None else None,
-                "price": bet.price,
-                "result": bet.result.value if bet.result else None,
-                "placed_at": bet.placed_at.isoformat() if bet.placed_at else None,
-                "notes": bet.notes,
-            }
-            for bet in rec.bets
-        ]
-
-        payload.append(
-            {
-                "id": rec.id,
-                "triggered_at": rec.triggered_at.isoformat() if rec.triggered_at else None,
-                "sportsbook": sportsbook.key if sportsbook else None,
-                "sportsbook_name": sportsbook.name if sportsbook else None,
-                "event": {
-                    "id": event.id if event else None,
-                    "sport_key": event.sport_key if event else None,
-                    "commence_time": event.commence_time.isoformat()
-                    if event and event.commence_time
-                    else None,
-                    "home_team": event.home_team if event else None,
-                    "away_team": event.away_team if event else None,
-                    "league": event.league if event else None,
-                },
-                "bet_side": rec.bet_side,
-                "team": team,
-                "movement": rec.direction.value,
-                "confidence": rec.confidence,
-                "status": rec.status.value if rec.status else None,
-                "details": rec.details or {},
-                "bet_logged": bool(bets_payload),
-                "bet_count": len(bets_payload),
-                "bets": bets_payload,
-                "unit_value": unit_value_float,
-            }
+    if ttl > 0:
+        chunks = _tee_into_cache(
+            chunks, cache, cache_key, ttl=ttl, stale_ttl=stale_ttl, generation=generation
         )
+    return current_app.response_class(chunks, mimetype="application/json")
+
+
+def _recommendation_rows(
+    limit: int, unit_value_float: float
+) -> Tuple[list, Dict[int, list]]:
+    rows = db.session.execute(
+        _LIVE_RECOMMENDATIONS, {"now": datetime.now(timezone.utc), "limit": limit}
+    ).all()
+
+    bets_by_rec: Dict[int, list] = {}
+    if rows:
+        bet_rows = db.session.execute(
+            _BETS_FOR_RECOMMENDATIONS, {"rec_ids": [row.id for row in rows]}
+        )
+        for bet in bet_rows:
+            bets_by_rec.setdefault(bet.recommendation_id, []).append(
+                {
+                    "id": bet.id,
+                    "stake_units": bet.stake,
+                    "stake_amount": bet.stake * unit_value_float
+                    if bet.stake is not None
+                    else None,
+                    "price": bet.price,
+                    "result": bet.result,
+                    "placed_at": bet.placed_at,
+                    "notes": bet.notes,
+                }
+            )
+
+    return rows, bets_by_rec
 
-    return jsonify(payload)
+
+def _encode_recommendations(
+    rows: list, bets_by_rec: Dict[int, list], unit_value_float: float
+) -> Iterator[bytes]:
+    """
+    Serialize one recommendation at a time so the full payload is never built as
+    Python objects.
+    """
+    yield b"["
+    for index, row in enumerate(rows):
+        chunk = dumps(_recommendation_item(row, bets_by_rec.get(row.id, []), unit_value_float))
+        yield b"," + chunk if index else chunk
+    yield b"]"
+
+
+def _tee_into_cache(
+    chunks: Iterator[bytes],
+    cache: ResponseCache,
+    cache_key: str,
+    ttl: float,
+    stale_ttl: float,
+    generation: Optional[str],
+) -> Iterator[bytes]:
+    """Pass chunks through to the client and cache the body once it is complete."""
+    seen: List[bytes] = []
+    for chunk in chunks:
+        seen.append(chunk)
+        yield chunk
+    cache.set(cache_key, b"".join(seen), ttl=ttl, stale_ttl=stale_ttl, generation=generation)
+
+
+def _recommendation_item(row, bets_payload: list, unit_value_float: float) -> dict:
+    team = None
+    if row.bet_side == "home":
+        team = row.home_team
+    elif row.bet_side == "away":
+        team = row.away_team
+
+    return {
+        "id": row.id,
+        "triggered_at": row.triggered_at,
+        "sportsbook": row.sportsbook_key,
+        "sportsbook_name": row.sportsbook_name,
+        "event": {
+            "id": row.event_id,
+            "sport_key": row.sport_key,
+            "commence_time": row.commence_time,
+            "home_team": row.home_team,
+            "away_team": row.away_team,
+            "league": row.league,
+        },
+        "bet_side": row.bet_side,
+        "team": team,
+        "movement": row.direction,
+        "confidence": row.confidence,
+        "status": row.status,
+        "details": row.details or {},
+        "bet_logged": bool(bets_payload),
+        "bet_count": len(bets_payload),
+        "bets": bets_payload,
+        "unit_value": unit_value_float,
+    }
+
+
+def _cached_json_response(entry: CachedBody):
+    response = json_bytes_response(entry.body)
+    response.set_etag(entry.etag)
+    return response.make_conditional(request)
 
 
 @api_bp.post("/ingest")
 def trigger_ingestion():
-    """Kick off an on-demand ingestion cycle."""
+    """Queue an on-demand ingestion cycle and return immediately."""
 
     app = current_app._get_current_object()
-    run_ingest_cycle(app)
-    return jsonify({"status": "ingestion_started"})
+    task_id = app.extensions["ingest_queue"].submit(app)
+    return orjson_response(
+        {
+            "status": "ingestion_queued",
+            "task_id": task_id,
+            "status_url": url_for("api.ingestion_status", task_id=task_id),
+        },
+        status=202,
+    )
+
+
+@api_bp.get("/ingest/<task_id>")
+def ingestion_status(task_id: str):
+    status = current_app.extensions["ingest_queue"].status(task_id)
+    if status is None:
+        return orjson_response({"error": "Unknown ingestion task"}, status=404)
+    return orjson_response({"task_id": task_id, "status": status})
 
 
 @api_bp.post("/recommendations/<int:rec_id>/bets")
 def log_bet(rec_id: int):
-    data = request.get_json() or {}
+    data = parse_json_body() or {}
 
-    recommendation = Recommendation.query.get_or_404(rec_id)
+    # Only column attributes are needed; fail loudly if a relationship ever lazy-loads.
+    recommendation = db.session.get(Recommendation, rec_id, options=[raiseload("*")])
+    if recommendation is None:
+        abort(404)
 
     try:
         stake = Decimal(str(data.get("stake", 1)))
     except Exception as exc:  # pylint: disable=broad-except
-        return jsonify({"error": f"Invalid stake: {exc}"}), 400
+        return orjson_response({"error": f"Invalid stake: {exc}"}, status=400)
 
     if stake <= 0:
-        return jsonify({"error": "Stake must be positive"}), 400
+        return orjson_response({"error": "Stake must be positive"}, status=400)
 
     details = recommendation.details or {}
 
     try:
         price = int(data.get("price") or details.get("current_price"))
     except (TypeError, ValueError):
-        return jsonify({"error": "Invalid price"}), 400
+        return orjson_response({"error": "Invalid price"}, status=400)
 
     notes = data.get("notes")
 
-    unit_value = Decimal(str(current_app.config.get("UNIT_VALUE", 1)))
+    unit_value = current_app.config["_UNIT_VALUE_DECIMAL"]
 
     bet = Bet(
         sportsbook_id=recommendation.sportsbook_id,
@@ -159,13 +295,14 @@ def log_bet(rec_id: int):
 
     db.session.add(bet)
     db.session.commit()
+    current_app.extensions["recommendations_cache"].invalidate()
 
-    return jsonify(
+    return orjson_response(
         {
             "status": "bet_logged",
             "bet_id": bet.id,
             "stake_units": float(stake),
             "stake_amount": float(stake * unit_value),
-            "unit_value": float(unit_value),
+            "unit_value": current_app.config["_UNIT_VALUE_FLOAT"],
         }
     )
@@ -18,11 +18,22 @@ class DefaultConfig:
     SQLALCHEMY_DATABASE_URI = os.getenv(
         "DATABASE_URL", f"sqlite:///{BASE_DIR / 'instance' / 'coachv2.db'}"
     )
-    SQLALCHEMY_ENGINE_OPTIONS = {"pool_pre_ping": True}
+    # pool_pre_ping costs one extra round trip per checkout but avoids failing requests
+    # on connections the database dropped while idle; disable it where that never happens.
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "1") == "1",
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "10")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "20")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        # Rows per multi-row INSERT when bulk inserting snapshots (SQLAlchemy default: 1000).
+        "insertmanyvalues_page_size": int(os.getenv("DB_INSERT_PAGE_SIZE", "1000")),
+    }
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     JSON_SORT_KEYS = False
     FLASK_ENV = os.getenv("FLASK_ENV", "development")
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    # Raise on lazy relationship loads (always on when Flask runs in debug mode).
+    STRICT_LOADING = os.getenv("STRICT_LOADING", "0") == "1"
 
     # Odds provider configuration
     ODDS_API_KEY = os.getenv("THE_ODDS_API_KEY", "")
@@ -58,3 +69,14 @@ class DefaultConfig:
     MOVEMENT_MEDIUM_MULTIPLIER = float(os.getenv("MOVEMENT_MEDIUM_MULTIPLIER", "2.0"))
     MOVEMENT_HIGH_MULTIPLIER = float(os.getenv("MOVEMENT_HIGH_MULTIPLIER", "3.0"))
     UNIT_VALUE = float(os.getenv("UNIT_VALUE", "1"))
+
+    # Shared response cache for web + worker processes; empty keeps it in-process.
+    REDIS_URL = os.getenv("REDIS_URL", "")
+    # Seconds to wait on a Redis connect/command before treating it as a cache miss.
+    REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", "0.5"))
+    # Short-lived cache for the recommendations list; 0 disables it.
+    RECOMMENDATIONS_CACHE_TTL = float(os.getenv("RECOMMENDATIONS_CACHE_TTL", "10"))
+    # How long an expired entry may still be served if the database is unavailable.
+    RECOMMENDATIONS_CACHE_STALE_TTL = float(
+        os.getenv("RECOMMENDATIONS_CACHE_STALE_TTL", "300")
+    )
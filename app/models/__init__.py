@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from enum import Enum as PyEnum
+from enum import StrEnum
+from functools import partial
 
 from sqlalchemy import (
     JSON,
@@ -10,29 +11,30 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
     UniqueConstraint,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import deferred, relationship
 
 from .. import db
 
+# Column default for created/updated stamps; a partial avoids a lambda frame per row.
+_utcnow = partial(datetime.now, timezone.utc)
+
+# Binary JSON on PostgreSQL; plain JSON elsewhere (SQLite in development).
+JSONPayload = JSON().with_variant(JSONB(), "postgresql")
+
 
 class BaseModel(db.Model):
     __abstract__ = True
 
     id = Column(Integer, primary_key=True)
-    created_at = Column(
-        DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc)
-    )
-    updated_at = Column(
-        DateTime(timezone=True),
-        nullable=False,
-        default=lambda: datetime.now(timezone.utc),
-        onupdate=lambda: datetime.now(timezone.utc),
-    )
+    created_at = Column(DateTime(timezone=True), nullable=False, default=_utcnow)
+    updated_at = Column(DateTime(timezone=True), nullable=False, default=_utcnow, onupdate=_utcnow)
 
 
 class Sportsbook(BaseModel):
@@ -50,14 +52,15 @@ class Sportsbook(BaseModel):
 class Event(BaseModel):
     __tablename__ = "events"
 
-    provider = Column(String(64), nullable=False, index=True)
+    provider = Column(String(64), nullable=False)
     provider_event_id = Column(String(128), nullable=False)
     sport_key = Column(String(128), nullable=False, index=True)
-    commence_time = Column(DateTime(timezone=True), nullable=True)
+    commence_time = Column(DateTime(timezone=True), nullable=True, index=True)
     home_team = Column(String(128), nullable=False)
     away_team = Column(String(128), nullable=False)
     league = Column(String(128), nullable=True)
-    raw = Column(JSON, nullable=True)
+    # Provider payloads are kept for debugging only; load them on explicit access.
+    raw = deferred(Column(JSONPayload, nullable=True))
 
     odds_snapshots = relationship("OddsSnapshot", back_populates="event")
     recommendations = relationship("Recommendation", back_populates="event")
@@ -80,7 +83,8 @@ class OddsSnapshot(BaseModel):
     home_implied_prob = Column(Numeric(scale=6, precision=10), nullable=True)
     away_implied_prob = Column(Numeric(scale=6, precision=10), nullable=True)
     draw_implied_prob = Column(Numeric(scale=6, precision=10), nullable=True)
-    raw = Column(JSON, nullable=True)
+    # Provider payloads are kept for debugging only; load them on explicit access.
+    raw = deferred(Column(JSONPayload, nullable=True))
 
     event = relationship("Event", back_populates="odds_snapshots")
     sportsbook = relationship("Sportsbook", back_populates="odds_snapshots")
@@ -97,13 +101,13 @@ class OddsSnapshot(BaseModel):
     )
 
 
-class MovementDirection(PyEnum):
+class MovementDirection(StrEnum):
     REVERSE = "reverse"
     FAVORITE = "favorite"
     UNCHANGED = "unchanged"
 
 
-class RecommendationStatus(PyEnum):
+class RecommendationStatus(StrEnum):
     PENDING = "pending"
     WAGERED = "wagered"
     SETTLED = "settled"
@@ -116,7 +120,7 @@ class Recommendation(BaseModel):
     event_id = Column(Integer, ForeignKey("events.id"), nullable=False)
     sportsbook_id = Column(Integer, ForeignKey("sportsbooks.id"), nullable=False)
     snapshot_id = Column(Integer, ForeignKey("odds_snapshots.id"), nullable=True)
-    triggered_at = Column(DateTime(timezone=True), nullable=False)
+    triggered_at = Column(DateTime(timezone=True), nullable=False, index=True)
     direction = Column(Enum(MovementDirection), nullable=False)
     movement_cents = Column(Integer, nullable=False)
     edge = Column(Numeric(scale=4, precision=8), nullable=True)
@@ -125,15 +129,20 @@ class Recommendation(BaseModel):
     stake_units = Column(Numeric(scale=4, precision=8), nullable=True)
     status = Column(Enum(RecommendationStatus), default=RecommendationStatus.PENDING, nullable=False)
     notes = Column(String(512), nullable=True)
-    details = Column(JSON, nullable=True)
+    details = Column(JSONPayload, nullable=True)
 
     event = relationship("Event", back_populates="recommendations")
     sportsbook = relationship("Sportsbook", back_populates="recommendations")
     snapshot = relationship("OddsSnapshot")
     bets = relationship("Bet", back_populates="recommendation")
 
+    __table_args__ = (
+        # Serves the movement cooldown lookup: equality on the first three, range on the last.
+        Index("ix_rec_cooldown", "event_id", "sportsbook_id", "bet_side", "triggered_at"),
+    )
+
 
-class BetResult(PyEnum):
+class BetResult(StrEnum):
     PENDING = "pending"
     WON = "won"
     LOST = "lost"
@@ -161,7 +170,7 @@ class Bet(BaseModel):
     recommendation = relationship("Recommendation", back_populates="bets")
 
 
-class LedgerSource(PyEnum):
+class LedgerSource(StrEnum):
     DEPOSIT = "deposit"
     WITHDRAWAL = "withdrawal"
     BET_RESULT = "bet_result"
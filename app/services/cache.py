@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Protocol
+
+from werkzeug.http import generate_etag
+
+try:  # Redis is optional; without REDIS_URL the in-process cache is used.
+    import redis
+except ImportError:  # pragma: no cover - depends on the deployment
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# Matches no real generation, so a body built from it is never written or read back.
+_UNAVAILABLE_GENERATION = "unavailable"
+
+
+@dataclass(frozen=True)
+class CachedBody:
+    body: bytes
+    etag: str
+    expires_at: float
+    stale_until: float
+
+
+class ResponseCache(Protocol):
+    def get(self, key: str, allow_stale: bool = False) -> Optional[CachedBody]:
+        ...
+
+    def generation(self) -> str:
+        ...
+
+    def set(
+        self, key: str, body: bytes, ttl: float, stale_ttl: float, generation: Optional[str] = None
+    ) -> CachedBody:
+        ...
+
+    def invalidate(self) -> None:
+        ...
+
+
+class LocalResponseCache:
+    """
+    Tiny in-process TTL cache for serialized JSON bodies. Entries stay around past
+    their TTL for a grace period so a view can fall back to them when the database
+    is unavailable.
+
+    Callers pass the generation read before building a body to `set`; if the cache
+    was invalidated in between, the now-outdated body is not stored.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, CachedBody] = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[CachedBody]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        return entry if _is_fresh(entry, time.time(), allow_stale) else None
+
+    def generation(self) -> str:
+        return str(self._generation)
+
+    def set(
+        self, key: str, body: bytes, ttl: float, stale_ttl: float, generation: Optional[str] = None
+    ) -> CachedBody:
+        entry = _build_entry(body, ttl, stale_ttl)
+        with self._lock:
+            if generation is None or generation == str(self._generation):
+                self._entries[key] = entry
+        return entry
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+class RedisResponseCache:
+    """
+    Redis-backed variant shared by every web and worker process. Keys embed a
+    generation counter, so invalidation is a single INCR and old entries simply
+    expire. A body built under an older generation is written under that generation's
+    key, where no reader looks. Redis errors degrade to cache misses rather than
+    failing the request, and reads/writes are skipped for `retry_after` seconds after
+    one so an unreachable host costs one timeout, not one per call. Invalidation is
+    always attempted.
+    """
+
+    def __init__(
+        self, client, namespace: str = "coachv2:cache", retry_after: float = 5.0
+    ) -> None:
+        self._client = client
+        self._namespace = namespace
+        self._generation_key = f"{namespace}:generation"
+        self._retry_after = retry_after
+        self._unavailable_until = 0.0
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[CachedBody]:
+        if not self._available():
+            return None
+        try:
+            data = self._client.hgetall(self._key(key))
+        except redis.RedisError:
+            logger.warning("Redis cache read failed for %s", key, exc_info=True)
+            self._back_off()
+            return None
+        if not data:
+            return None
+        entry = CachedBody(
+            body=data[b"body"],
+            etag=data[b"etag"].decode(),
+            expires_at=float(data[b"expires_at"]),
+            stale_until=float(data[b"stale_until"]),
+        )
+        return entry if _is_fresh(entry, time.time(), allow_stale) else None
+
+    def generation(self) -> str:
+        if not self._available():
+            return _UNAVAILABLE_GENERATION
+        try:
+            return self._current_generation()
+        except redis.RedisError:
+            logger.warning("Redis cache generation read failed", exc_info=True)
+            self._back_off()
+            return _UNAVAILABLE_GENERATION
+
+    def set(
+        self, key: str, body: bytes, ttl: float, stale_ttl: float, generation: Optional[str] = None
+    ) -> CachedBody:
+        entry = _build_entry(body, ttl, stale_ttl)
+        if generation == _UNAVAILABLE_GENERATION or not self._available():
+            return entry
+        try:
+            redis_key = self._key(key, generation)
+            pipe = self._client.pipeline()
+            pipe.hset(
+                redis_key,
+                mapping={
+                    "body": entry.body,
+                    "etag": entry.etag,
+                    "expires_at": entry.expires_at,
+                    "stale_until": entry.stale_until,
+                },
+            )
+            pipe.expire(redis_key, max(1, int(ttl + stale_ttl)))
+            pipe.execute()
+        except redis.RedisError:
+            logger.warning("Redis cache write failed for %s", key, exc_info=True)
+            self._back_off()
+        return entry
+
+    def invalidate(self) -> None:
+        try:
+            self._client.incr(self._generation_key)
+        except redis.RedisError:
+            logger.warning("Redis cache invalidation failed", exc_info=True)
+
+    def _available(self) -> bool:
+        return time.monotonic() >= self._unavailable_until
+
+    def _back_off(self) -> None:
+        self._unavailable_until = time.monotonic() + self._retry_after
+
+    def _key(self, key: str, generation: Optional[str] = None) -> str:
+        if generation is None:
+            generation = self._current_generation()
+        return f"{self._namespace}:{generation}:{key}"
+
+    def _current_generation(self) -> str:
+        return (self._client.get(self._generation_key) or b"0").decode()
+
+
+def build_response_cache(redis_url: str, socket_timeout: float = 0.5) -> ResponseCache:
+    if redis_url:
+        if redis is None:
+            logger.warning("REDIS_URL is set but the redis package is missing; using local cache")
+        else:
+            # Bounded so a stalled Redis host raises (and degrades to a miss) instead of
+            # blocking requests and the end of ingest cycles.
+            client = redis.Redis.from_url(
+                redis_url,
+                socket_timeout=socket_timeout,
+                socket_connect_timeout=socket_timeout,
+            )
+            return RedisResponseCache(client)
+    return LocalResponseCache()
+
+
+def _build_entry(body: bytes, ttl: float, stale_ttl: float) -> CachedBody:
+    now = time.time()
+    return CachedBody(
+        body=body,
+        etag=generate_etag(body),
+        expires_at=now + ttl,
+        stale_until=now + ttl + stale_ttl,
+    )
+
+
+def _is_fresh(entry: CachedBody, now: float, allow_stale: bool) -> bool:
+    return now < entry.expires_at or (allow_stale and now < entry.stale_until)
@@ -1,3 +1,3 @@
-from .detector import detect_reverse_line_move
+from .detector import detect_reverse_line_move_batch
 
-__all__ = ["detect_reverse_line_move"]
+__all__ = ["detect_reverse_line_move_batch"]
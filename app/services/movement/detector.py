@@ -1,60 +1,121 @@
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass
-from datetime import timedelta
+import math
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 from flask import current_app
+from sqlalchemy import func, tuple_
 
+from app import db
 from app.models import (
     MovementDirection,
     Recommendation,
     RecommendationStatus,
 )
+from app.utils.datetimes import as_utc
 from app.utils.odds import american_to_implied_probability
 
 logger = logging.getLogger(__name__)
 
+_DELTA_QUANTUM = Decimal("0.0001")
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class MovementResult:
     bet_side: str
     movement_cents: int
     probability_delta: Decimal
     previous_price: int
     current_price: int
-    previous_probability: Decimal
-    current_probability: Decimal
+    previous_probability: float
+    current_probability: float
+
+
+@dataclass(frozen=True, slots=True)
+class MovementConfig:
+    threshold_cents: int = 15
+    cooldown_minutes: int = 180
+    medium_multiplier: float = 2.0
+    high_multiplier: float = 3.0
+    # Whole-cent cut-offs for the confidence buckets, derived from the multipliers.
+    medium_cents: int = field(init=False)
+    high_cents: int = field(init=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self, "medium_cents", math.ceil(self.threshold_cents * self.medium_multiplier)
+        )
+        object.__setattr__(
+            self, "high_cents", math.ceil(self.threshold_cents * self.high_multiplier)
+        )
+
+    @classmethod
+    def from_app(cls) -> "MovementConfig":
+        config = current_app.config
+        return cls(
+            threshold_cents=config.get("MOVEMENT_THRESHOLD_CENTS", 15),
+            cooldown_minutes=config.get("MOVEMENT_COOLDOWN_MINUTES", 180),
+            medium_multiplier=config.get("MOVEMENT_MEDIUM_MULTIPLIER", 2.0),
+            high_multiplier=config.get("MOVEMENT_HIGH_MULTIPLIER", 3.0),
+        )
 
 
-def detect_reverse_line_move(snapshot, previous_snapshot) -> Optional[Recommendation]:
+def detect_reverse_line_move_batch(candidates: Iterable[tuple]) -> List[Recommendation]:
     """
-    Decide whether the incoming snapshot represents a reverse moneyline move worth flagging.
-    Returns a Recommendation instance ready to be persisted if criteria are met.
+    Decide which incoming snapshots represent a reverse moneyline move worth flagging
+    and return Recommendation instances ready to be persisted. Takes
+    (snapshot, previous_snapshot) pairs and checks the cooldown for all of them with
+    a single query. Candidates later in the batch also honour recommendations
+    produced earlier in the same batch. Snapshots only need the price, key and
+    fetched_at attributes, so callers may pass lightweight rows instead of models.
     """
 
-    if previous_snapshot is None:
-        return None
-
-    movement = _evaluate_movement(snapshot, previous_snapshot)
-    if movement is None:
-        return None
-
-    threshold_cents = current_app.config.get("MOVEMENT_THRESHOLD_CENTS", 15)
-    cooldown_minutes = current_app.config.get("MOVEMENT_COOLDOWN_MINUTES", 180)
-    medium_multiplier = current_app.config.get("MOVEMENT_MEDIUM_MULTIPLIER", 2.0)
-    high_multiplier = current_app.config.get("MOVEMENT_HIGH_MULTIPLIER", 3.0)
-
-    if movement.movement_cents < threshold_cents:
-        return None
-
-    if not _passes_cooldown(snapshot, movement.bet_side, cooldown_minutes):
-        return None
-
+    settings = MovementConfig.from_app()
+    threshold_cents = settings.threshold_cents
+    cooldown_minutes = settings.cooldown_minutes
+
+    moves: List[tuple] = []
+    for snapshot, previous_snapshot in candidates:
+        if previous_snapshot is None:
+            continue
+        movement = _evaluate_movement(snapshot, previous_snapshot)
+        if movement is None or movement.movement_cents < threshold_cents:
+            continue
+        moves.append((snapshot, movement))
+
+    if not moves:
+        return []
+
+    cooldown = timedelta(minutes=cooldown_minutes)
+    latest_triggered: Dict[Tuple[int, int, str], datetime] = {}
+    if cooldown_minutes > 0:
+        keys = {(snap.event_id, snap.sportsbook_id, move.bet_side) for snap, move in moves}
+        window_start = min(snap.fetched_at for snap, _ in moves) - cooldown
+        latest_triggered = _latest_recommendations(keys, window_start)
+
+    recommendations: List[Recommendation] = []
+    for snapshot, movement in moves:
+        if cooldown_minutes > 0:
+            key = (snapshot.event_id, snapshot.sportsbook_id, movement.bet_side)
+            last = latest_triggered.get(key)
+            if last is not None and last >= snapshot.fetched_at - cooldown:
+                continue
+            if last is None or snapshot.fetched_at > last:
+                latest_triggered[key] = snapshot.fetched_at
+        recommendations.append(_build_recommendation(snapshot, movement, settings))
+
+    return recommendations
+
+
+def _build_recommendation(
+    snapshot, movement: MovementResult, settings: MovementConfig
+) -> Recommendation:
     confidence = _confidence_bucket(
-        movement.movement_cents, threshold_cents, medium_multiplier, high_multiplier
+        movement.movement_cents, settings.medium_cents, settings.high_cents
     )
 
     recommendation = Recommendation(
@@ -72,10 +133,10 @@ def detect_reverse_line_move(snapshot, previous_snapshot) -> Optional[Recommenda
         details={
             "previous_price": movement.previous_price,
             "current_price": movement.current_price,
-            "previous_probability": str(movement.previous_probability),
-            "current_probability": str(movement.current_probability),
+            "previous_probability": f"{movement.previous_probability:.6f}",
+            "current_probability": f"{movement.current_probability:.6f}",
             "probability_delta": str(movement.probability_delta),
-            "threshold_cents": threshold_cents,
+            "threshold_cents": settings.threshold_cents,
         },
     )
 
@@ -103,22 +164,22 @@ def _evaluate_movement(snapshot, previous_snapshot) -> Optional[MovementResult]:
         )
         return None
 
-    prev_price = previous[underdog_side]["price"]
-    current_price = current[underdog_side]["price"]
-
-    if prev_price is None or current_price is None:
-        return None
+    prev_price = previous[underdog_side]
+    current_price = current[underdog_side]
 
     movement_cents = prev_price - current_price
     if movement_cents <= 0:
         # Line moved away from the underdog or remained unchanged.
         return None
 
-    prev_prob = previous[underdog_side]["probability"].quantize(Decimal("0.000001"))
-    current_prob = current[underdog_side]["probability"].quantize(Decimal("0.000001"))
-    prob_delta = (current_prob - prev_prob).quantize(Decimal("0.0001"))
+    # Float math for the probabilities; the delta is taken in whole millionths so the
+    # single 4-dp rounding (half-even, as Decimal.quantize) works on an exact value.
+    prev_prob = round(american_to_implied_probability(prev_price), 6)
+    current_prob = round(american_to_implied_probability(current_price), 6)
+    delta_micros = round(current_prob * 1e6) - round(prev_prob * 1e6)
+    prob_delta = Decimal(delta_micros).scaleb(-6).quantize(_DELTA_QUANTUM)
 
-    if prob_delta <= Decimal("0"):
+    if prob_delta <= 0:
         # Safety check – we expect the underdog probability to increase for a reverse move.
         return None
 
@@ -137,52 +198,49 @@ def _snapshot_prices(snapshot):
     if snapshot.home_price is None or snapshot.away_price is None:
         return None
 
-    home_prob = american_to_implied_probability(snapshot.home_price)
-    away_prob = american_to_implied_probability(snapshot.away_price)
-
-    return {
-        "home": {"price": snapshot.home_price, "probability": home_prob},
-        "away": {"price": snapshot.away_price, "probability": away_prob},
-    }
-
+    return {"home": snapshot.home_price, "away": snapshot.away_price}
 
-def _identify_underdog(data) -> Optional[str]:
-    home_prob = data["home"]["probability"]
-    away_prob = data["away"]["probability"]
 
-    if home_prob is None or away_prob is None:
-        return None
+def _identify_underdog(prices) -> Optional[str]:
+    home_price = prices["home"]
+    away_price = prices["away"]
 
-    if home_prob == away_prob:
+    # Implied probability falls as the American price rises, so the higher price is the
+    # underdog; +100 and -100 are both even money.
+    if home_price == away_price or abs(home_price) == abs(away_price) == 100:
         return None
 
-    return "home" if home_prob < away_prob else "away"
-
-
-def _passes_cooldown(snapshot, bet_side: str, cooldown_minutes: int) -> bool:
-    if cooldown_minutes <= 0:
-        return True
+    return "home" if home_price > away_price else "away"
 
-    window_start = snapshot.fetched_at - timedelta(minutes=cooldown_minutes)
 
-    existing = (
-        Recommendation.query.filter_by(
-            event_id=snapshot.event_id,
-            sportsbook_id=snapshot.sportsbook_id,
-            bet_side=bet_side,
+def _latest_recommendations(
+    keys: Set[Tuple[int, int, str]], window_start: datetime
+) -> Dict[Tuple[int, int, str], datetime]:
+    """Most recent trigger time per (event, sportsbook, side) since `window_start`."""
+    rows = (
+        db.session.query(
+            Recommendation.event_id,
+            Recommendation.sportsbook_id,
+            Recommendation.bet_side,
+            func.max(Recommendation.triggered_at),
         )
-        .filter(Recommendation.triggered_at >= window_start)
-        .first()
+        .filter(
+            Recommendation.triggered_at >= window_start,
+            tuple_(
+                Recommendation.event_id, Recommendation.sportsbook_id, Recommendation.bet_side
+            ).in_(list(keys)),
+        )
+        .group_by(
+            Recommendation.event_id, Recommendation.sportsbook_id, Recommendation.bet_side
+        )
+        .all()
     )
-
-    return existing is None
+    return {(event_id, book_id, side): as_utc(latest) for event_id, book_id, side, latest in rows}
 
 
-def _confidence_bucket(
-    movement_cents: int, threshold: int, medium_multiplier: float, high_multiplier: float
-) -> str:
-    if movement_cents >= threshold * high_multiplier:
+def _confidence_bucket(movement_cents: int, medium_cents: int, high_cents: int) -> str:
+    if movement_cents >= high_cents:
         return "high"
-    if movement_cents >= threshold * medium_multiplier:
+    if movement_cents >= medium_cents:
         return "medium"
     return "low"
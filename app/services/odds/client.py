@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Iterable, List, Protocol
 
 from flask import current_app
@@ -71,12 +72,29 @@ class OddsClient:
         self.providers = list(providers)
 
     def fetch_moneyline_odds(self, sports: Iterable[str]) -> List[dict]:
-        aggregated: List[dict] = []
-        for provider in self.providers:
-            logger.info("Fetching odds from %s", provider.name)
-            try:
-                aggregated.extend(provider.fetch_moneyline_odds(sports))
-            except Exception as exc:  # pylint: disable=broad-except
-                logger.exception("Provider %s failed: %s", provider.name, exc)
-        return aggregated
+        if not self.providers:
+            return []
+
+        sports = list(sports)
+        app = current_app._get_current_object()
+
+        # Provider calls are network-bound, so run them side by side; worker threads
+        # need their own app context for config access.
+        def fetch(provider: OddsProvider) -> List[dict]:
+            with app.app_context():
+                return self._safe_fetch(provider, sports)
+
+        with ThreadPoolExecutor(max_workers=len(self.providers)) as executor:
+            results = list(executor.map(fetch, self.providers))
+
+        return [item for provider_results in results for item in provider_results]
+
+    @staticmethod
+    def _safe_fetch(provider: OddsProvider, sports: List[str]) -> List[dict]:
+        logger.info("Fetching odds from %s", provider.name)
+        try:
+            return provider.fetch_moneyline_odds(sports)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.exception("Provider %s failed: %s", provider.name, exc)
+            return []
 
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Iterable, List
 
+import orjson
 import requests
 from flask import current_app
+from requests.adapters import HTTPAdapter
 from tenacity import retry, stop_after_attempt, wait_fixed
 
 from ..client import OddsProvider, OddsProviderRegistry
@@ -12,6 +15,7 @@ from ..client import OddsProvider, OddsProviderRegistry
 logger = logging.getLogger(__name__)
 
 BASE_URL = "https://api.the-odds-api.com/v4"
+MAX_CONCURRENT_REQUESTS = 4
 
 
 class TheOddsAPI(OddsProvider):
@@ -21,19 +25,52 @@ class TheOddsAPI(OddsProvider):
         if not api_key:
             raise ValueError("The Odds API key is required")
         self.api_key = api_key
+        self._base_params = {
+            "apiKey": api_key,
+            "regions": "us",
+            "markets": "h2h",
+            "oddsFormat": "american",
+            "dateFormat": "iso",
+        }
+        # One pooled session keeps TLS connections alive across sports and cycles.
+        # Retries are left to tenacity on _get.
+        self._session = requests.Session()
+        self._session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=MAX_CONCURRENT_REQUESTS,
+                pool_maxsize=MAX_CONCURRENT_REQUESTS,
+                max_retries=0,
+            ),
+        )
 
     @retry(stop=stop_after_attempt(3), wait=wait_fixed(2))
     def _get(self, path: str, params: dict) -> requests.Response:
         url = f"{BASE_URL}{path}"
         logger.debug("Requesting %s with params %s", url, params)
-        response = requests.get(url, params=params, timeout=15)
+        response = self._session.get(url, params=params, timeout=15)
         response.raise_for_status()
         return response
 
     def fetch_moneyline_odds(self, sports: Iterable[str]) -> List[dict]:
+        sports = list(sports)
+        if not sports:
+            return []
+
+        # Build the query once per cycle; the per-sport requests below run in worker
+        # threads without an app context and only read it.
+        params = dict(self._base_params)
+        bookmakers = current_app.config.get("BOOKMAKERS", [])
+        if bookmakers:
+            params["bookmakers"] = ",".join(bookmakers)
+
+        with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_REQUESTS, len(sports))) as executor:
+            responses = list(
+                executor.map(lambda sport: self._fetch_sport_odds(sport, params), sports)
+            )
+
         results: List[dict] = []
-        for sport in sports:
-            data = self._fetch_sport_odds(sport)
+        for sport, data in zip(sports, responses):
             results.extend(
                 {
                     "provider": self.name,
@@ -44,23 +81,12 @@ class TheOddsAPI(OddsProvider):
             )
         return results
 
-    def _fetch_sport_odds(self, sport: str) -> List[dict]:
-        bookmakers = current_app.config.get("BOOKMAKERS", [])
-        params = {
-            "apiKey": self.api_key,
-            "regions": "us",
-            "markets": "h2h",
-            "oddsFormat": "american",
-            "dateFormat": "iso",
-        }
-        if bookmakers:
-            params["bookmakers"] = ",".join(bookmakers)
-
+    def _fetch_sport_odds(self, sport: str, params: dict) -> List[dict]:
         response = self._get(f"/sports/{sport}/odds", params=params)
         remaining = response.headers.get("x-requests-remaining")
         if remaining is not None:
             logger.debug("The Odds API remaining requests: %s", remaining)
-        return response.json()
+        return orjson.loads(response.content)
 
 
 def _register() -> None:
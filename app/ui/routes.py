@@ -5,12 +5,18 @@ from flask import current_app, render_template
 from . import ui_bp
 
 
+@ui_bp.app_context_processor
+def inject_display_settings() -> dict:
+    """Expose display settings to every template instead of passing them per view."""
+
+    return {
+        "unit_value": current_app.config.get("UNIT_VALUE", 1),
+        "display_timezone": current_app.config.get("TIMEZONE", "America/New_York"),
+    }
+
+
 @ui_bp.get("/")
 def dashboard():
     """Render the main dashboard shell. Data loads asynchronously via API."""
 
-    return render_template(
-        "index.html",
-        unit_value=current_app.config.get("UNIT_VALUE", 1),
-        display_timezone=current_app.config.get("TIMEZONE", "America/New_York"),
-    )
+    return render_template("index.html")
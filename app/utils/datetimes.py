@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+
+def as_utc(value: datetime) -> datetime:
+    """
+    Attach UTC to naive datetimes. SQLite hands stored timestamps back without a
+    timezone; everything we store is UTC.
+    """
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
@@ -1,20 +1,17 @@
 from __future__ import annotations
 
-from decimal import Decimal, getcontext
+from functools import lru_cache
 
-getcontext().prec = 12
 
-
-def american_to_implied_probability(odds: int) -> Decimal:
+@lru_cache(maxsize=4096)
+def american_to_implied_probability(odds: int) -> float:
     """
-    Convert American odds to implied probability.
+    Convert American odds to implied probability. Memoized since a fetch only
+    contains a few dozen distinct prices.
     """
     if odds is None:
-        return Decimal("0")
-
-    odds_decimal = Decimal(odds)
-
-    if odds_decimal > 0:
-        return Decimal(100) / (odds_decimal + Decimal(100))
-    return -odds_decimal / (-odds_decimal + Decimal(100))
+        return 0.0
 
+    if odds > 0:
+        return 100.0 / (odds + 100.0)
+    return -odds / (-odds + 100.0)
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from flask.json.provider import JSONProvider
+
+ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+
+
+def orjson_default(obj: Any) -> Any:
+    """
+    Fallback for types orjson does not serialize natively (datetimes, enums and
+    dataclasses are handled in Rust already).
+    """
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> bytes:
+    """The one orjson encoding used for API bodies and Flask's JSON provider alike."""
+    return orjson.dumps(obj, default=orjson_default, option=ORJSON_OPTIONS)
+
+
+class ORJSONProvider(JSONProvider):
+    """
+    Flask JSON provider backed by orjson so ``jsonify`` and ``request.get_json``
+    use the same encoder as the pre-serialized API responses.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return dumps(obj).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
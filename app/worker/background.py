@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+from .tasks import run_ingest_cycle
+
+logger = logging.getLogger(__name__)
+
+
+class IngestQueue:
+    """
+    Runs on-demand ingestion cycles off the request thread. A single worker thread
+    keeps cycles from overlapping; recent jobs are tracked so clients can poll them.
+    While a cycle is queued or running, further submissions return its task id rather
+    than stacking up more cycles (each one spends provider quota).
+    """
+
+    def __init__(self, max_tracked: int = 20) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="coachv2-ingest")
+        self._jobs: "OrderedDict[str, Future]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_tracked = max_tracked
+
+    def submit(self, app) -> str:
+        with self._lock:
+            pending = self._pending_task_id()
+            if pending is not None:
+                return pending
+
+            task_id = uuid.uuid4().hex
+            future = self._executor.submit(run_ingest_cycle, app)
+            self._jobs[task_id] = future
+            while len(self._jobs) > self._max_tracked:
+                self._jobs.popitem(last=False)
+
+        def _finished(done: Future) -> None:
+            exc = done.exception()
+            if exc is not None:
+                logger.error("Ingestion task %s failed", task_id, exc_info=exc)
+
+        future.add_done_callback(_finished)
+        return task_id
+
+    def _pending_task_id(self) -> Optional[str]:
+        # Jobs run one at a time in submission order, so only the newest can be pending.
+        if not self._jobs:
+            return None
+        task_id, future = next(reversed(self._jobs.items()))
+        return None if future.done() else task_id
+
+    def status(self, task_id: str) -> Optional[str]:
+        future = self._jobs.get(task_id)
+        if future is None:
+            return None
+        if not future.done():
+            return "running" if future.running() else "queued"
+        return "failed" if future.exception() is not None else "finished"
@@ -13,10 +13,10 @@ logger = logging.getLogger(__name__)
 
 
 def register_cron_job(
-    scheduler: BlockingScheduler, cron_expr: str, job_id: str, app_context_arg
+    scheduler: BlockingScheduler, cron_expr: str, job_id: str, app_context_arg, timezone: str
 ) -> None:
     try:
-        trigger = CronTrigger.from_crontab(cron_expr, timezone=app_context_arg.config["TIMEZONE"])
+        trigger = CronTrigger.from_crontab(cron_expr, timezone=timezone)
     except ValueError as exc:
         logger.error("Invalid cron expression '%s': %s", cron_expr, exc)
         return
@@ -33,12 +33,13 @@ def register_cron_job(
 
 def main() -> None:
     app = create_app()
-    scheduler = BlockingScheduler(timezone=app.config["TIMEZONE"])
+    timezone = app.config["TIMEZONE"]
+    scheduler = BlockingScheduler(timezone=timezone)
 
-    register_cron_job(scheduler, app.config["INGEST_CRON_MORNING"], "ingest-morning", app)
-    register_cron_job(scheduler, app.config["INGEST_CRON_EVENING"], "ingest-evening", app)
+    register_cron_job(scheduler, app.config["INGEST_CRON_MORNING"], "ingest-morning", app, timezone)
+    register_cron_job(scheduler, app.config["INGEST_CRON_EVENING"], "ingest-evening", app, timezone)
 
-    logger.info("CoachV2 scheduler started with timezone %s", app.config["TIMEZONE"])
+    logger.info("CoachV2 scheduler started with timezone %s", timezone)
 
     try:
         scheduler.start()
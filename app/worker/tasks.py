@@ -1,21 +1,44 @@
 from __future__ import annotations
 
 import logging
+from bisect import bisect_left
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Dict, Iterable, List, Optional
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from dateutil import parser as date_parser
 from flask import current_app
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import IntegrityError
 
 from app import db
 from app.models import Event, MovementDirection, OddsSnapshot, Sportsbook
-from app.services.movement import detect_reverse_line_move
+from app.services.movement import detect_reverse_line_move_batch
 from app.services.odds import OddsClient, OddsProviderRegistry
+from app.utils.datetimes import as_utc
 from app.utils.odds import american_to_implied_probability
 
 logger = logging.getLogger(__name__)
 
+# Columns of uq_snapshot_unique_event, in the order used for snapshot keys.
+SNAPSHOT_KEY_COLUMNS = ["event_id", "sportsbook_id", "provider", "market_key", "fetched_at"]
+
+
+@dataclass(slots=True)
+class PendingSnapshot:
+    """The fields movement detection reads from a snapshot that is about to be inserted."""
+
+    event_id: int
+    sportsbook_id: int
+    fetched_at: datetime
+    home_price: Optional[int]
+    away_price: Optional[int]
+    id: Optional[int] = None
+
 
 def run_ingest_cycle(app) -> None:
     """
@@ -39,6 +62,8 @@ def run_ingest_cycle(app) -> None:
         data = client.fetch_moneyline_odds(sports)
 
         persist_snapshot_batch(data)
+        # New events/recommendations change the API list; drop cached responses.
+        current_app.extensions["recommendations_cache"].invalidate()
 
 
 def persist_snapshot_batch(data: List[dict]) -> None:
@@ -50,21 +75,27 @@ def persist_snapshot_batch(data: List[dict]) -> None:
         return
 
     bookmakers = current_app.config.get("BOOKMAKERS", [])
+    allowed_books = frozenset(bookmakers)
+    # Fallback fetch time for bookmakers without last_update; one stamp per batch.
+    now_utc = datetime.now(timezone.utc)
 
-    _ensure_sportsbooks(bookmakers)
-    sportsbook_lookup = _sportsbook_lookup(bookmakers)
+    sportsbook_ids = _sportsbook_ids(tuple(bookmakers))
 
-    inserted = 0
     skipped = 0
     recommendations_created = 0
     recommendations_by_event: Dict[int, list] = {}
 
+    events = _upsert_events(data)
+
+    # Pass 1: parse every bookmaker entry into an insert row; no database access.
+    snapshot_rows: List[dict] = []
+    pending: List[PendingSnapshot] = []
+    series_keys: List[tuple] = []
+    seen_keys = set()
     for event_payload in data:
         provider_name = event_payload.get("provider", "unknown")
         event_data = event_payload.get("event", {})
-        sport_key = event_payload.get("sport_key")
-
-        event = _upsert_event(provider_name, sport_key, event_data)
+        event = events[(provider_name, event_data.get("id"))]
 
         bookmaker_entries = event_data.get("bookmakers", [])
         if not bookmaker_entries:
@@ -72,15 +103,16 @@ def persist_snapshot_batch(data: List[dict]) -> None:
 
         for bookmaker in bookmaker_entries:
             book_key = bookmaker.get("key")
-            if bookmakers and book_key not in bookmakers:
+            if allowed_books and book_key not in allowed_books:
                 continue
 
-            sportsbook = sportsbook_lookup.get(book_key)
-            if not sportsbook:
+            sportsbook_id = sportsbook_ids.get(book_key)
+            if not sportsbook_id:
                 continue
 
             fetched_at = _parse_datetime(bookmaker.get("last_update"))
-            market = _extract_market(bookmaker.get("markets", []), key="h2h")
+            markets_by_key = {m.get("key"): m for m in (bookmaker.get("markets") or [])}
+            market = markets_by_key.get("h2h")
             if not market:
                 continue
 
@@ -89,48 +121,100 @@ def persist_snapshot_batch(data: List[dict]) -> None:
             away_price = outcomes.get(event.away_team)
             draw_price = outcomes.get("Draw") or outcomes.get("draw")
 
-            if _snapshot_exists(event.id, sportsbook.id, provider_name, fetched_at):
+            market_key = market.get("key", "h2h")
+            fetched_at = fetched_at or now_utc
+            series_key = (event.id, sportsbook_id, provider_name, market_key)
+            if series_key + (fetched_at,) in seen_keys:
                 skipped += 1
                 continue
-
-            previous_snapshot = _previous_snapshot(
-                event.id,
-                sportsbook.id,
-                provider_name,
-                market.get("key", "h2h"),
-                fetched_at,
-            )
-
-            snapshot = OddsSnapshot(
-                event_id=event.id,
-                sportsbook_id=sportsbook.id,
-                provider=provider_name,
-                fetched_at=fetched_at or datetime.now(timezone.utc),
-                market_key=market.get("key", "h2h"),
-                home_price=home_price,
-                away_price=away_price,
-                draw_price=draw_price,
-                home_implied_prob=_to_decimal(home_price),
-                away_implied_prob=_to_decimal(away_price),
-                draw_implied_prob=_to_decimal(draw_price),
-                raw={
-                    "bookmaker": {
-                        "key": bookmaker.get("key"),
-                        "title": bookmaker.get("title"),
+            seen_keys.add(series_key + (fetched_at,))
+
+            snapshot_rows.append(
+                {
+                    "event_id": event.id,
+                    "sportsbook_id": sportsbook_id,
+                    "provider": provider_name,
+                    "fetched_at": fetched_at,
+                    "market_key": market_key,
+                    "home_price": home_price,
+                    "away_price": away_price,
+                    "draw_price": draw_price,
+                    "home_implied_prob": _to_decimal(home_price),
+                    "away_implied_prob": _to_decimal(away_price),
+                    "draw_implied_prob": _to_decimal(draw_price),
+                    "raw": {
+                        "bookmaker": {
+                            "key": bookmaker.get("key"),
+                            "title": bookmaker.get("title"),
+                        },
+                        "market": market,
                     },
-                    "market": market,
-                },
+                }
             )
+            pending.append(
+                PendingSnapshot(
+                    event_id=event.id,
+                    sportsbook_id=sportsbook_id,
+                    fetched_at=fetched_at,
+                    home_price=home_price,
+                    away_price=away_price,
+                )
+            )
+            series_keys.append(series_key)
+
+    # Pass 2: resolve each row's previous snapshot from one bulk lookup of stored data
+    # plus earlier rows of the same series in this batch, matching what a row-by-row
+    # insert would have seen.
+    previous_by_pending: List[Optional[object]] = []
+    # Fetch times (sorted) and rows of the series' earlier new rows in this batch, so a
+    # row that arrives after a newer price still finds its real predecessor.
+    pending_by_series: Dict[tuple, Tuple[List[datetime], List[PendingSnapshot]]] = {}
+    with db.session.no_autoflush:
+        existing = _stored_snapshot_keys(snapshot_rows)
+        stored = _latest_stored_snapshots(series_keys, [row["fetched_at"] for row in snapshot_rows])
+        for snapshot, series_key in zip(pending, series_keys):
+            if series_key + (snapshot.fetched_at,) in existing:
+                # Already stored; the insert will skip it and later rows keep comparing
+                # against the stored prices.
+                previous_by_pending.append(None)
+                continue
 
-            db.session.add(snapshot)
-            db.session.flush()
+            previous_snapshot = stored.get(series_key)
+            if previous_snapshot is not None and (
+                as_utc(previous_snapshot.fetched_at) > snapshot.fetched_at
+            ):
+                # Provider resent an older price than we hold; look up its predecessor.
+                previous_snapshot = _previous_snapshot(*series_key, snapshot.fetched_at)
+
+            times, rows = pending_by_series.setdefault(series_key, ([], []))
+            index = bisect_left(times, snapshot.fetched_at)
+            if index and (
+                previous_snapshot is None
+                or as_utc(previous_snapshot.fetched_at) < times[index - 1]
+            ):
+                previous_snapshot = rows[index - 1]
+            times.insert(index, snapshot.fetched_at)
+            rows.insert(index, snapshot)
+
+            previous_by_pending.append(previous_snapshot)
+
+    # Pass 3: bulk write, then detect movement over the whole batch.
+    # Rows that already exist are dropped by the database; only new ones come back.
+    inserted_ids = _insert_snapshots(snapshot_rows)
+    candidates = []
+    for row, snapshot, previous_snapshot in zip(snapshot_rows, pending, previous_by_pending):
+        snapshot.id = inserted_ids.get(_snapshot_key(row))
+        if snapshot.id is None:
+            skipped += 1
+            continue
+        candidates.append((snapshot, previous_snapshot))
+    inserted = len(candidates)
 
-            recommendation = detect_reverse_line_move(snapshot, previous_snapshot)
-            if recommendation:
-                db.session.add(recommendation)
-                recommendations_created += 1
-                recommendations_by_event.setdefault(event.id, []).append(recommendation)
-            inserted += 1
+    # Movement detection runs once over the whole batch so the cooldown check is one query.
+    for recommendation in detect_reverse_line_move_batch(candidates):
+        db.session.add(recommendation)
+        recommendations_created += 1
+        recommendations_by_event.setdefault(recommendation.event_id, []).append(recommendation)
 
     try:
         db.session.commit()
@@ -149,6 +233,31 @@ def persist_snapshot_batch(data: List[dict]) -> None:
     )
 
 
+def _insert_snapshots(rows: List[dict]) -> Dict[tuple, int]:
+    """
+    Insert snapshot rows in one executemany (batched into multi-row VALUES by
+    SQLAlchemy) instead of flushing an ORM object per row. Rows that collide with
+    uq_snapshot_unique_event are skipped by the database. Returns the ids of the
+    inserted rows keyed by `_snapshot_key`.
+    """
+    if not rows:
+        return {}
+
+    stmt = _dialect_insert(OddsSnapshot).on_conflict_do_nothing(
+        index_elements=SNAPSHOT_KEY_COLUMNS
+    )
+    key_columns = [getattr(OddsSnapshot, name) for name in SNAPSHOT_KEY_COLUMNS]
+    result = db.session.execute(stmt.returning(OddsSnapshot.id, *key_columns), rows)
+    return {
+        (event_id, sportsbook_id, provider, market_key, as_utc(fetched_at)): snapshot_id
+        for snapshot_id, event_id, sportsbook_id, provider, market_key, fetched_at in result
+    }
+
+
+def _snapshot_key(row: dict) -> tuple:
+    return tuple(row[name] for name in SNAPSHOT_KEY_COLUMNS)
+
+
 def _ensure_sportsbooks(bookmakers: Iterable[str]) -> None:
     if not bookmakers:
         return
@@ -164,62 +273,89 @@ def _ensure_sportsbooks(bookmakers: Iterable[str]) -> None:
         sportsbook = Sportsbook(key=key, name=key.title())
         db.session.add(sportsbook)
 
-    db.session.commit()
+    # Flush only; the batch's final commit makes new books and their snapshots atomic.
+    db.session.flush()
 
 
-def _sportsbook_lookup(bookmakers: Iterable[str]) -> Dict[str, Sportsbook]:
+def _sportsbook_ids(bookmakers: Tuple[str, ...]) -> Dict[str, int]:
+    """Sportsbook ids by key, creating any configured books that are missing."""
+    if not bookmakers:
+        # "Every book" changes as books are added, so it is always read fresh.
+        return _load_sportsbook_ids(bookmakers)
+
+    # Sportsbooks are only ever added, so committed ids can live as long as the app.
+    # The cache hangs off the app so apps bound to different databases never share it.
+    cache = current_app.extensions["sportsbook_ids"]
+    ids = cache.get(bookmakers)
+    if ids is not None:
+        return ids
+
+    ids = _load_sportsbook_ids(bookmakers)
+    if any(key not in ids for key in bookmakers):
+        _ensure_sportsbooks(bookmakers)
+        # New rows are uncommitted until the batch commits, so don't cache them yet;
+        # the next cycle reloads the committed state.
+        return _load_sportsbook_ids(bookmakers)
+    cache[bookmakers] = ids
+    return ids
+
+
+def _load_sportsbook_ids(bookmakers: Tuple[str, ...]) -> Dict[str, int]:
+    query = select(Sportsbook.key, Sportsbook.id)
     if bookmakers:
-        records = Sportsbook.query.filter(Sportsbook.key.in_(list(bookmakers))).all()
-    else:
-        records = Sportsbook.query.all()
-    return {record.key: record for record in records}
-
+        query = query.where(Sportsbook.key.in_(bookmakers))
+    return dict(db.session.execute(query).all())
 
-def _upsert_event(provider: str, sport_key: str, payload: dict) -> Event:
-    event = Event.query.filter_by(
-        provider=provider, provider_event_id=payload.get("id")
-    ).first()
 
-    commence_time = _parse_datetime(payload.get("commence_time"))
-
-    if event:
-        event.sport_key = sport_key
-        event.commence_time = commence_time
-        event.home_team = payload.get("home_team")
-        event.away_team = payload.get("away_team")
-        event.league = payload.get("sport_title")
-        event.raw = payload
-    else:
-        event = Event(
-            provider=provider,
-            provider_event_id=payload.get("id"),
-            sport_key=sport_key,
-            commence_time=commence_time,
-            home_team=payload.get("home_team"),
-            away_team=payload.get("away_team"),
-            league=payload.get("sport_title"),
-            raw=payload,
-        )
-        db.session.add(event)
-        db.session.flush()  # ensure ID for relationships
-
-    return event
-
-
-def _snapshot_exists(
-    event_id: int, sportsbook_id: int, provider: str, fetched_at: Optional[datetime]
-) -> bool:
-    if not fetched_at:
-        return False
-    return (
-        OddsSnapshot.query.filter_by(
-            event_id=event_id,
-            sportsbook_id=sportsbook_id,
-            provider=provider,
-            fetched_at=fetched_at,
-        ).first()
-        is not None
+def _upsert_events(data: List[dict]) -> Dict[tuple, Any]:
+    """
+    Insert or refresh every event in the batch with one INSERT ... ON CONFLICT DO
+    UPDATE. Returns rows with id, home_team and away_team keyed by
+    (provider, provider_event_id).
+    """
+    # Later payloads for the same event win, and an upsert may touch each row only once.
+    rows: Dict[tuple, dict] = {}
+    for event_payload in data:
+        provider = event_payload.get("provider", "unknown")
+        payload = event_payload.get("event", {})
+        rows[(provider, payload.get("id"))] = {
+            "provider": provider,
+            "provider_event_id": payload.get("id"),
+            "sport_key": event_payload.get("sport_key"),
+            "commence_time": _parse_datetime(payload.get("commence_time")),
+            "home_team": payload.get("home_team"),
+            "away_team": payload.get("away_team"),
+            "league": payload.get("sport_title"),
+            "raw": payload,
+        }
+
+    stmt = _dialect_insert(Event)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["provider", "provider_event_id"],
+        set_={
+            column: stmt.excluded[column]
+            for column in (
+                "sport_key",
+                "commence_time",
+                "home_team",
+                "away_team",
+                "league",
+                "raw",
+                "updated_at",
+            )
+        },
+    ).returning(
+        Event.id, Event.provider, Event.provider_event_id, Event.home_team, Event.away_team
     )
+    result = db.session.execute(stmt, list(rows.values()))
+    return {(row.provider, row.provider_event_id): row for row in result}
+
+
+def _dialect_insert(model):
+    # PostgreSQL in production, SQLite in development; both support ON CONFLICT.
+    if db.session.get_bind().dialect.name == "sqlite":
+        return sqlite_insert(model)
+    return pg_insert(model)
 
 
 def _previous_snapshot(
@@ -228,16 +364,79 @@ def _previous_snapshot(
     provider: str,
     market_key: str,
     fetched_at: Optional[datetime],
-) -> Optional[OddsSnapshot]:
-    query = OddsSnapshot.query.filter_by(
-        event_id=event_id,
-        sportsbook_id=sportsbook_id,
-        provider=provider,
-        market_key=market_key,
+):
+    """
+    Latest stored snapshot before `fetched_at` for the series, as a row with just the
+    fields movement detection reads (fetched_at, home_price, away_price).
+    """
+    query = select(
+        OddsSnapshot.fetched_at, OddsSnapshot.home_price, OddsSnapshot.away_price
+    ).where(
+        OddsSnapshot.event_id == event_id,
+        OddsSnapshot.sportsbook_id == sportsbook_id,
+        OddsSnapshot.provider == provider,
+        OddsSnapshot.market_key == market_key,
     )
     if fetched_at is not None:
-        query = query.filter(OddsSnapshot.fetched_at < fetched_at)
-    return query.order_by(OddsSnapshot.fetched_at.desc()).first()
+        query = query.where(OddsSnapshot.fetched_at < fetched_at)
+    return db.session.execute(
+        query.order_by(OddsSnapshot.fetched_at.desc()).limit(1)
+    ).first()
+
+
+def _stored_snapshot_keys(rows: List[dict]) -> set:
+    """Keys (as `_snapshot_key`) of the batch rows that are already stored."""
+    if not rows:
+        return set()
+
+    key_columns = [getattr(OddsSnapshot, name) for name in SNAPSHOT_KEY_COLUMNS]
+    result = db.session.execute(
+        select(*key_columns).where(tuple_(*key_columns).in_([_snapshot_key(row) for row in rows]))
+    )
+    return {
+        (event_id, sportsbook_id, provider, market_key, as_utc(fetched_at))
+        for event_id, sportsbook_id, provider, market_key, fetched_at in result
+    }
+
+
+def _latest_stored_snapshots(series_keys: List[tuple], fetched_ats: List[datetime]) -> dict:
+    """
+    Latest stored snapshot per (event_id, sportsbook_id, provider, market_key) series
+    fetched before the newest row in the batch, as rows with fetched_at, home_price and
+    away_price. Two queries regardless of batch size: a grouped max over the unique
+    index, then a keyed fetch of those rows.
+    """
+    if not series_keys:
+        return {}
+
+    series_columns = (
+        OddsSnapshot.event_id,
+        OddsSnapshot.sportsbook_id,
+        OddsSnapshot.provider,
+        OddsSnapshot.market_key,
+    )
+    latest = db.session.execute(
+        select(*series_columns, func.max(OddsSnapshot.fetched_at))
+        .where(
+            tuple_(*series_columns).in_(list(set(series_keys))),
+            OddsSnapshot.fetched_at < max(fetched_ats),
+        )
+        .group_by(*series_columns)
+    ).all()
+    if not latest:
+        return {}
+
+    rows = db.session.execute(
+        select(
+            *series_columns,
+            OddsSnapshot.fetched_at,
+            OddsSnapshot.home_price,
+            OddsSnapshot.away_price,
+        ).where(tuple_(*series_columns, OddsSnapshot.fetched_at).in_([tuple(r) for r in latest]))
+    )
+    return {
+        (row.event_id, row.sportsbook_id, row.provider, row.market_key): row for row in rows
+    }
 
 
 def _promote_multi_book_recommendations(recommendations_by_event: Dict[int, list]) -> None:
@@ -262,37 +461,45 @@ def _promote_multi_book_recommendations(recommendations_by_event: Dict[int, list
         db.session.commit()
 
 
-def _extract_market(markets: List[dict], key: str) -> Optional[dict]:
-    for market in markets or []:
-        if market.get("key") == key:
-            return market
-    return None
-
-
 def _map_outcomes(outcomes: List[dict]) -> Dict[str, int]:
-    mapped: Dict[str, int] = {}
-    for outcome in outcomes or []:
-        name = outcome.get("name")
-        price = outcome.get("price")
-        if name is not None and price is not None:
-            mapped[name] = price
-    return mapped
+    return {
+        outcome["name"]: outcome["price"]
+        for outcome in outcomes or []
+        if outcome.get("name") is not None and outcome.get("price") is not None
+    }
 
 
 def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
     if not value:
         return None
+    # The same commence_time/last_update strings repeat across bookmakers, so strings
+    # go through a cache; anything else (a malformed payload) is parsed uncached.
+    if isinstance(value, str):
+        return _parse_datetime_str(value)
+    return _parse_datetime_uncached(value)
+
+
+@lru_cache(maxsize=4096)
+def _parse_datetime_str(value: str) -> Optional[datetime]:
+    return _parse_datetime_uncached(value)
+
+
+def _parse_datetime_uncached(value: Any) -> Optional[datetime]:
     try:
-        dt = date_parser.isoparse(value)
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-        return dt.astimezone(timezone.utc)
+        try:
+            # C implementation; handles the trailing "Z" on Python 3.11+.
+            dt = datetime.fromisoformat(value)
+        except ValueError:
+            dt = date_parser.isoparse(value)
+        return as_utc(dt).astimezone(timezone.utc)
     except (ValueError, TypeError):
         logger.debug("Failed to parse datetime value '%s'", value)
         return None
 
 
-def _to_decimal(price: Optional[int]):
+@lru_cache(maxsize=2048)
+def _to_decimal(price: Optional[int]) -> Optional[Decimal]:
+    # Prices repeat across bookmakers (-110 everywhere); Decimals are immutable, so share them.
     if price is None:
         return None
-    return american_to_implied_probability(price)
+    return Decimal(f"{american_to_implied_probability(price):.6f}")
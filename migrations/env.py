@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 from logging.config import fileConfig
 
 from alembic import context
@@ -24,6 +25,10 @@ config.set_main_option("sqlalchemy.url", app.config["SQLALCHEMY_DATABASE_URI"])
 
 target_metadata = db.metadata
 
+# Column type comparison only matters for autogenerate and reflects every column;
+# set ALEMBIC_COMPARE_TYPE=0 to skip it when iterating locally.
+COMPARE_TYPE = os.getenv("ALEMBIC_COMPARE_TYPE", "1") == "1"
+
 
 def run_migrations_offline() -> None:
     url = config.get_main_option("sqlalchemy.url")
@@ -31,7 +36,7 @@ def run_migrations_offline() -> None:
         url=url,
         target_metadata=target_metadata,
         literal_binds=True,
-        compare_type=True,
+        compare_type=COMPARE_TYPE,
         dialect_opts={"paramstyle": "named"},
     )
 
@@ -50,7 +55,7 @@ def run_migrations_online() -> None:
         context.configure(
             connection=connection,
             target_metadata=target_metadata,
-            compare_type=True,
+            compare_type=COMPARE_TYPE,
         )
 
         with context.begin_transaction():
@@ -216,13 +216,13 @@ def downgrade() -> None:
     op.drop_table("sportsbooks")
     sa.Enum(
         "PENDING", "WON", "LOST", "PUSH", "VOID", name="betresult"
-    ).drop(op.get_bind())
+    ).drop(op.get_bind(), checkfirst=True)
     sa.Enum(
         "REVERSE", "FAVORITE", "UNCHANGED", name="movementdirection"
-    ).drop(op.get_bind())
+    ).drop(op.get_bind(), checkfirst=True)
     sa.Enum(
         "PENDING", "WAGERED", "SETTLED", "DISMISSED", name="recommendationstatus"
-    ).drop(op.get_bind())
+    ).drop(op.get_bind(), checkfirst=True)
     sa.Enum(
         "DEPOSIT", "WITHDRAWAL", "BET_RESULT", "ADJUSTMENT", name="ledgersource"
-    ).drop(op.get_bind())
+    ).drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,35 @@
+"""Index the columns used to filter and order the recommendations list.
+
+Revision ID: 0002_rec_listing_indexes
+Revises: 0001_initial_schema
+Create Date: 2026-10-15
+"""
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "0002_rec_listing_indexes"
+down_revision = "0001_initial_schema"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Lets the planner walk recommendations newest-first and stop at LIMIT
+    # instead of sorting the whole table.
+    op.create_index(
+        op.f("ix_recommendations_triggered_at"),
+        "recommendations",
+        ["triggered_at"],
+    )
+    op.create_index(
+        op.f("ix_events_commence_time"),
+        "events",
+        ["commence_time"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_events_commence_time"), table_name="events")
+    op.drop_index(op.f("ix_recommendations_triggered_at"), table_name="recommendations")
@@ -0,0 +1,27 @@
+"""Composite index for the movement cooldown lookup.
+
+Revision ID: 0003_rec_cooldown_index
+Revises: 0002_rec_listing_indexes
+Create Date: 2026-10-15
+"""
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "0003_rec_cooldown_index"
+down_revision = "0002_rec_listing_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_rec_cooldown",
+        "recommendations",
+        ["event_id", "sportsbook_id", "bet_side", "triggered_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_rec_cooldown", table_name="recommendations")
@@ -0,0 +1,52 @@
+"""Store provider payloads and recommendation details as JSONB on PostgreSQL.
+
+Revision ID: 0004_jsonb_payload_columns
+Revises: 0003_rec_cooldown_index
+Create Date: 2026-10-15
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+
+revision = "0004_jsonb_payload_columns"
+down_revision = "0003_rec_cooldown_index"
+branch_labels = None
+depends_on = None
+
+COLUMNS = (
+    ("events", "raw"),
+    ("odds_snapshots", "raw"),
+    ("recommendations", "details"),
+)
+
+
+def upgrade() -> None:
+    # Other dialects keep the generic JSON type.
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for table, column in COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=postgresql.JSONB(),
+            existing_type=sa.JSON(),
+            existing_nullable=True,
+            postgresql_using=f"{column}::jsonb",
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for table, column in COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=sa.JSON(),
+            existing_type=postgresql.JSONB(),
+            existing_nullable=True,
+            postgresql_using=f"{column}::json",
+        )
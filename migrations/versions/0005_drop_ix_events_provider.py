@@ -0,0 +1,27 @@
+"""Drop ix_events_provider; uq_event_provider_id already covers provider lookups.
+
+Revision ID: 0005_drop_ix_events_provider
+Revises: 0004_jsonb_payload_columns
+Create Date: 2026-10-15
+"""
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "0005_drop_ix_events_provider"
+down_revision = "0004_jsonb_payload_columns"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index(op.f("ix_events_provider"), table_name="events")
+
+
+def downgrade() -> None:
+    op.create_index(
+        op.f("ix_events_provider"),
+        "events",
+        ["provider"],
+    )
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import pytest
+
+from app import create_app, db
+from app.models import Recommendation
+from app.worker.tasks import persist_snapshot_batch
+
+
+class _TestConfig:
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = "sqlite://"
+    REDIS_URL = ""
+    BOOKMAKERS = ["draftkings"]
+    MOVEMENT_THRESHOLD_CENTS = 15
+    MOVEMENT_COOLDOWN_MINUTES = 0
+
+
+@pytest.fixture
+def app():
+    app = create_app(_TestConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def _bookmaker(last_update: str, home_price: int, away_price: int) -> dict:
+    return {
+        "key": "draftkings",
+        "title": "DraftKings",
+        "last_update": last_update,
+        "markets": [
+            {
+                "key": "h2h",
+                "outcomes": [
+                    {"name": "Home", "price": home_price},
+                    {"name": "Away", "price": away_price},
+                ],
+            }
+        ],
+    }
+
+
+def _payload(*bookmakers: dict) -> list:
+    return [
+        {
+            "provider": "theoddsapi",
+            "sport_key": "basketball_nba",
+            "event": {
+                "id": "e1",
+                "sport_title": "NBA",
+                "commence_time": "2026-01-01T20:00:00Z",
+                "home_team": "Home",
+                "away_team": "Away",
+                "bookmakers": list(bookmakers),
+            },
+        }
+    ]
+
+
+def test_out_of_order_row_compares_against_its_in_batch_predecessor(app):
+    persist_snapshot_batch(
+        _payload(
+            _bookmaker("2026-01-01T06:00:00Z", -150, 300),
+            _bookmaker("2026-01-01T11:00:00Z", -100, -140),
+            _bookmaker("2026-01-01T10:00:00Z", 130, 250),
+        )
+    )
+
+    recommendations = Recommendation.query.all()
+    assert [(rec.bet_side, rec.movement_cents) for rec in recommendations] == [("away", 50)]
+    assert recommendations[0].triggered_at.hour == 10
+
+
+def test_resent_stored_row_is_not_used_as_predecessor(app):
+    persist_snapshot_batch(_payload(_bookmaker("2026-01-01T06:00:00Z", -150, 300)))
+    persist_snapshot_batch(
+        _payload(
+            # Same key as the stored row, so the insert drops it and its prices.
+            _bookmaker("2026-01-01T06:00:00Z", -150, 450),
+            _bookmaker("2026-01-01T07:00:00Z", -150, 390),
+        )
+    )
+
+    # 07:00 follows the stored 06:00 (+300), so the underdog drifted out: no move.
+    assert Recommendation.query.count() == 0